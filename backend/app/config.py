@@ -9,6 +9,11 @@ from functools import lru_cache
 import json
 
 
+def _split_csv(value: str) -> list[str]:
+    """Split a comma-separated setting into a list of non-empty items."""
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
 class Settings(BaseSettings):
     """Application settings loaded from environment variables."""
     
@@ -18,6 +23,30 @@ class Settings(BaseSettings):
     # Gemini API
     GEMINI_API_KEY: str = ""
     
+    # Gemini model routing - comma-separated candidates per route, in preference order
+    # "chat" = short translations, "translation" = long or hard-pair translations
+    GEMINI_CHAT_MODELS: str = "gemini-2.5-flash-lite,gemini-2.5-flash"
+    GEMINI_TRANSLATION_MODELS: str = "gemini-2.5-flash,gemini-2.5-flash-lite"
+    GEMINI_SUMMARY_MODELS: str = "gemini-2.5-pro,gemini-2.5-flash"
+    # Texts up to this many characters count as short chat turns
+    GEMINI_SHORT_TEXT_CHARS: int = 200
+    # Languages whose pairs always use the translation route, even for short texts
+    GEMINI_COMPLEX_LANGUAGES: str = "zh,ja,ko,ar,hi"
+    # A model is considered degraded on a route above these rolling error rate / latency levels
+    GEMINI_MAX_ERROR_RATE: float = 0.5
+    GEMINI_CHAT_MAX_LATENCY_MS: float = 8000.0
+    GEMINI_TRANSLATION_MAX_LATENCY_MS: float = 15000.0
+    GEMINI_SUMMARY_MAX_LATENCY_MS: float = 60000.0
+    # How long a degraded model is skipped before it is probed again
+    GEMINI_DEGRADED_COOLDOWN_SECONDS: float = 60.0
+    
+    # Idempotency-Key store for POST /message and POST /summary
+    IDEMPOTENCY_MAX_KEYS: int = 10000
+    IDEMPOTENCY_TTL_SECONDS: float = 86400.0
+    
+    # Responses smaller than this many bytes are sent uncompressed
+    COMPRESSION_MINIMUM_SIZE: int = 1024
+    
     # App settings
     APP_NAME: str = "Healthcare Translation API"
     DEBUG: bool = False
@@ -36,6 +65,29 @@ class Settings(BaseSettings):
                 pass
         return [o.strip() for o in origins.split(",") if o.strip()]
     
+    @property
+    def gemini_routes(self) -> dict[str, list[str]]:
+        """Candidate models per routing purpose, in preference order."""
+        return {
+            "chat": _split_csv(self.GEMINI_CHAT_MODELS),
+            "translation": _split_csv(self.GEMINI_TRANSLATION_MODELS),
+            "summary": _split_csv(self.GEMINI_SUMMARY_MODELS),
+        }
+    
+    @property
+    def gemini_max_latency_ms(self) -> dict[str, float]:
+        """Rolling latency above which a model counts as degraded, per route."""
+        return {
+            "chat": self.GEMINI_CHAT_MAX_LATENCY_MS,
+            "translation": self.GEMINI_TRANSLATION_MAX_LATENCY_MS,
+            "summary": self.GEMINI_SUMMARY_MAX_LATENCY_MS,
+        }
+    
+    @property
+    def gemini_complex_languages(self) -> set[str]:
+        """Language codes that route translations to the stronger model."""
+        return set(_split_csv(self.GEMINI_COMPLEX_LANGUAGES))
+    
     class Config:
         env_file = ".env"
         env_file_encoding = "utf-8"
@@ -0,0 +1,139 @@
+"""
+Speculative draft translations while the user is typing.
+Trade-off: In-process store per worker. A send that lands on a different worker
+than its drafts simply translates as before; use Redis if running many workers.
+"""
+
+import asyncio
+import hashlib
+from collections import OrderedDict
+from typing import Optional
+
+from app.gemini import translate_text, TRANSLATION_FAILED_PREFIX
+
+# Maximum number of (conversation, role) drafts kept in memory
+MAX_DRAFTS = 1000
+
+# Draft outcomes reported to the client
+DRAFT_READY = "ready"
+DRAFT_SUPERSEDED = "superseded"  # A newer draft for the same key cancelled this one
+DRAFT_FAILED = "failed"  # Gemini could not translate the text
+
+
+def text_hash(text: str) -> str:
+    """Stable hash of a message text, used to match drafts against the final send."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class DraftTranslator:
+    """
+    Keeps the latest draft translation per (conversation, role).
+
+    A new draft for the same conversation and role cancels the in-flight one,
+    since only the text the user is currently looking at can still be sent.
+    """
+
+    def __init__(self, max_drafts: int = MAX_DRAFTS):
+        self.max_drafts = max_drafts
+        # (conversationId, role) -> (text hash, translation)
+        self._ready: OrderedDict[tuple[str, str], tuple[str, str]] = OrderedDict()
+        # (conversationId, role) -> (text hash, translation task)
+        self._inflight: dict[tuple[str, str], tuple[str, asyncio.Task]] = {}
+
+    async def draft(
+        self,
+        conversation_id: str,
+        role: str,
+        text: str,
+        source_lang: str,
+        target_lang: str,
+    ) -> tuple[str, Optional[str]]:
+        """
+        Translate a draft text, superseding any older draft for the same key.
+
+        Returns (status, translation). The translation is None unless the
+        status is DRAFT_READY.
+        """
+        key = (conversation_id, role)
+        digest = text_hash(text)
+
+        ready = self._ready.get(key)
+        if ready and ready[0] == digest:
+            return DRAFT_READY, ready[1]
+
+        inflight = self._inflight.get(key)
+        if inflight and inflight[0] == digest:
+            task = inflight[1]
+        else:
+            if inflight:
+                inflight[1].cancel()
+            task = asyncio.create_task(
+                self._translate(key, digest, text, source_lang, target_lang)
+            )
+            self._inflight[key] = (digest, task)
+
+        return await self._wait(task)
+
+    async def consume(self, conversation_id: str, role: str, text: str) -> Optional[str]:
+        """
+        Take the draft translation for a final message text, if one matches.
+
+        Waits for a matching in-flight draft rather than starting a second
+        Gemini call. Returns None when no draft matches.
+        """
+        key = (conversation_id, role)
+        digest = text_hash(text)
+
+        ready = self._ready.get(key)
+        if ready and ready[0] == digest:
+            del self._ready[key]
+            return ready[1]
+
+        inflight = self._inflight.get(key)
+        if inflight and inflight[0] == digest:
+            _, translation = await self._wait(inflight[1])
+            self._ready.pop(key, None)
+            return translation
+
+        return None
+
+    async def _wait(self, task: asyncio.Task) -> tuple[str, Optional[str]]:
+        # Shield so a disconnecting client does not cancel a draft another request may reuse
+        try:
+            translation = await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if task.cancelled():
+                return DRAFT_SUPERSEDED, None
+            raise
+        if translation is None:
+            return DRAFT_FAILED, None
+        return DRAFT_READY, translation
+
+    async def _translate(
+        self,
+        key: tuple[str, str],
+        digest: str,
+        text: str,
+        source_lang: str,
+        target_lang: str,
+    ) -> Optional[str]:
+        """Run one draft translation; returns None if Gemini failed."""
+        try:
+            translation = await translate_text(text, source_lang, target_lang)
+        finally:
+            if self._inflight.get(key, (None,))[0] == digest:
+                del self._inflight[key]
+
+        # translate_text reports failures in-band; never reuse those for a real send
+        if translation.startswith(TRANSLATION_FAILED_PREFIX):
+            return None
+
+        self._ready[key] = (digest, translation)
+        self._ready.move_to_end(key)
+        while len(self._ready) > self.max_drafts:
+            self._ready.popitem(last=False)
+        return translation
+
+
+# Shared instance used by the message endpoints
+draft_translator = DraftTranslator()
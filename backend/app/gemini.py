@@ -4,14 +4,23 @@ Trade-off: Using REST API directly due to Python 3.14 compatibility issues with
 For production, consider downgrading to Python 3.12 for full SDK support.
 """
 
+import time
+from typing import Optional
+
 import httpx
 from app.config import get_settings
+from app.routing import ModelRouter
 
 settings = get_settings()
 
-# Gemini API endpoint
-# Using gemini-2.5-flash which is the latest fast model
-GEMINI_API_URL = "https://generativelanguage.googleapis.com/v1beta/models/gemini-2.5-flash:generateContent"
+# Gemini API endpoint template; the model is chosen per request by the router
+GEMINI_API_URL = "https://generativelanguage.googleapis.com/v1beta/models/{model}:generateContent"
+
+# Marker prepended to the original text when translation fails
+TRANSLATION_FAILED_PREFIX = "[Translation failed]"
+
+# Shared router so latency / error statistics accumulate across requests
+model_router = ModelRouter(settings)
 
 
 # Supported languages for the MVP
@@ -32,14 +41,49 @@ SUPPORTED_LANGUAGES = {
 }
 
 
-async def call_gemini(prompt: str) -> str:
+async def call_gemini(
+    prompt: str,
+    purpose: str = "translation",
+    text: Optional[str] = None,
+    source_lang: Optional[str] = None,
+    target_lang: Optional[str] = None,
+) -> str:
+    """
+    Call Gemini via the model router, falling back to the next candidate on failure.
+    
+    Args:
+        prompt: Full prompt to send
+        purpose: 'translation' or 'summary'
+        text: The user-facing text the prompt wraps (used for length-based routing)
+        source_lang / target_lang: Language pair, for translations
+    """
+    decision = model_router.route(purpose, text if text is not None else prompt, source_lang, target_lang)
+    if not decision.candidates:
+        raise Exception(f"No Gemini models configured for route: {decision.route}")
+    
+    last_error: Optional[Exception] = None
+    for model in decision.candidates:
+        start = time.perf_counter()
+        try:
+            result = await call_gemini_model(prompt, model)
+        except Exception as e:
+            model_router.record(decision, model, (time.perf_counter() - start) * 1000, ok=False)
+            last_error = e
+            continue
+        model_router.record(decision, model, (time.perf_counter() - start) * 1000, ok=True)
+        return result
+    
+    raise last_error
+
+
+async def call_gemini_model(prompt: str, model: str) -> str:
     """
-    Call Gemini API directly via REST.
+    Call a specific Gemini model directly via REST.
     Trade-off: Using REST API instead of SDK for Python 3.14 compatibility.
     """
     async with httpx.AsyncClient() as client:
         response = await client.post(
-            f"{GEMINI_API_URL}?key={settings.GEMINI_API_KEY}",
+            f"{GEMINI_API_URL.format(model=model)}?key={settings.GEMINI_API_KEY}",
             json={
                 "contents": [{"parts": [{"text": prompt}]}],
                 "generationConfig": {
@@ -92,12 +136,18 @@ Text to translate:
 Translation:"""
 
     try:
-        return (await call_gemini(prompt)).strip()
+        return (await call_gemini(
+            prompt,
+            purpose="translation",
+            text=text,
+            source_lang=source_lang,
+            target_lang=target_lang,
+        )).strip()
     except Exception as e:
         # Trade-off: Return original text on error rather than failing
         # In production, implement proper error handling and retries
         print(f"Translation error: {e}")
-        return f"[Translation failed] {text}"
+        return f"{TRANSLATION_FAILED_PREFIX} {text}"
 
 
 async def generate_summary(messages: list[dict]) -> str:
@@ -139,7 +189,7 @@ CONVERSATION:
 SUMMARY:"""
 
     try:
-        return (await call_gemini(prompt)).strip()
+        return (await call_gemini(prompt, purpose="summary", text=conversation_text)).strip()
     except Exception as e:
         print(f"Summary generation error: {e}")
         return "Unable to generate summary. Please try again."
@@ -0,0 +1,122 @@
+"""
+Idempotency-Key support for endpoints that call Gemini.
+Trade-off: Bounded in-process store per worker. Retries usually reach the same
+worker within seconds; use Redis or a DB table if running many workers.
+"""
+
+import asyncio
+import hashlib
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Optional
+
+from fastapi import HTTPException
+from pydantic import BaseModel
+
+
+@dataclass
+class IdempotencyEntry:
+    """A request seen under an idempotency key and its (possibly pending) result."""
+    fingerprint: str
+    result: asyncio.Future
+    created_at: float
+
+
+def _retrieve_exception(future: asyncio.Future) -> None:
+    # Mark failures as retrieved so asyncio does not warn when nobody was waiting
+    if not future.cancelled():
+        future.exception()
+
+
+class IdempotencyStore:
+    """
+    Remembers recent responses by (scope, Idempotency-Key).
+
+    A retry with a known key gets the stored response without re-running the
+    handler. A concurrent duplicate waits on the in-flight request instead of
+    starting its own. Failed requests are forgotten so the client can retry.
+    """
+
+    def __init__(self, max_keys: int, ttl_seconds: float):
+        self.max_keys = max_keys
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[str, IdempotencyEntry] = OrderedDict()
+
+    def _evict(self) -> None:
+        """
+        Drop expired entries, then the oldest ones beyond max_keys.
+
+        In-flight entries are never evicted, otherwise a concurrent duplicate
+        would start a second call; the store can briefly exceed max_keys by
+        the number of requests in flight.
+        """
+        cutoff = time.monotonic() - self.ttl_seconds
+        excess = len(self._entries) - self.max_keys
+        evicted = []
+        for store_key, entry in self._entries.items():
+            if not entry.result.done():
+                continue
+            if entry.created_at < cutoff or excess > 0:
+                evicted.append(store_key)
+                excess -= 1
+            else:
+                # Entries are in insertion order, so nothing later has expired either
+                break
+        for store_key in evicted:
+            del self._entries[store_key]
+
+    async def run(
+        self,
+        scope: str,
+        key: Optional[str],
+        request: BaseModel,
+        handler: Callable[[], Awaitable[Any]],
+    ) -> Any:
+        """
+        Run handler once per (scope, key); without a key it always runs.
+
+        Raises 422 if the key was already used with a different request body.
+        """
+        if not key:
+            return await handler()
+
+        self._evict()
+        store_key = f"{scope}:{key}"
+        fingerprint = hashlib.sha256(request.model_dump_json().encode("utf-8")).hexdigest()
+
+        entry = self._entries.get(store_key)
+        if entry:
+            if entry.fingerprint != fingerprint:
+                raise HTTPException(422, "Idempotency-Key was already used with a different request")
+            # Shield so a disconnecting duplicate cannot cancel the original request's work
+            try:
+                return await asyncio.shield(entry.result)
+            except asyncio.CancelledError:
+                if not entry.result.cancelled():
+                    raise
+                # The original request was cancelled before finishing; take over from it
+                return await self.run(scope, key, request, handler)
+
+        entry = IdempotencyEntry(
+            fingerprint=fingerprint,
+            result=asyncio.get_running_loop().create_future(),
+            created_at=time.monotonic(),
+        )
+        entry.result.add_done_callback(_retrieve_exception)
+        self._entries[store_key] = entry
+        self._evict()
+
+        try:
+            result = await handler()
+        except BaseException as e:
+            if self._entries.get(store_key) is entry:
+                del self._entries[store_key]
+            if isinstance(e, asyncio.CancelledError):
+                entry.result.cancel()
+            else:
+                entry.result.set_exception(e)
+            raise
+
+        entry.result.set_result(result)
+        return result
@@ -0,0 +1,71 @@
+"""
+Denormalized conversation inbox: last-message fields and keyset cursors.
+Trade-off: Previews are stored twice, once per party's language, so the
+inbox never has to join Message to show what the viewer would see in chat.
+"""
+
+import base64
+from datetime import datetime
+
+from fastapi import HTTPException
+
+from app.schemas import MESSAGE_PREVIEW_LENGTH
+
+
+def preview_field(role: str) -> str:
+    """Conversation column holding the last-message preview in role's language."""
+    return "doctorPreview" if role == "doctor" else "patientPreview"
+
+
+def message_previews(sender_role: str, original_text: str, translated_text: str) -> dict[str, str]:
+    """
+    Preview of a message for each party: the sender sees their original text,
+    the other party sees the translation, matching the chat view.
+    """
+    recipient_role = "patient" if sender_role == "doctor" else "doctor"
+    return {
+        preview_field(sender_role): original_text[:MESSAGE_PREVIEW_LENGTH],
+        preview_field(recipient_role): translated_text[:MESSAGE_PREVIEW_LENGTH],
+    }
+
+
+async def record_message(transaction, message) -> None:
+    """
+    Update a conversation's inbox fields for a newly created message.
+
+    Must run inside the transaction that created the message. The count always
+    increments; the last-message fields only move forward, because doctor and
+    patient can send at the same moment and an older message may commit second.
+    """
+    await transaction.conversation.update(
+        where={"id": message.conversationId},
+        data={"messageCount": {"increment": 1}}
+    )
+
+    await transaction.conversation.update_many(
+        where={
+            "id": message.conversationId,
+            "lastActivityAt": {"lte": message.createdAt},
+        },
+        data={
+            **message_previews(message.role, message.originalText, message.translatedText),
+            "lastMessageRole": message.role,
+            "lastActivityAt": message.createdAt,
+        }
+    )
+
+
+def encode_inbox_cursor(conversation) -> str:
+    """Encode the (lastActivityAt, id) keyset position of a conversation as an opaque cursor."""
+    raw = f"{conversation.lastActivityAt.isoformat()}|{conversation.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_inbox_cursor(cursor: str) -> tuple[datetime, str]:
+    """Decode a cursor produced by encode_inbox_cursor."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+        timestamp, conversation_id = raw.split("|", 1)
+        return datetime.fromisoformat(timestamp), conversation_id
+    except ValueError:
+        raise HTTPException(400, "Invalid cursor")
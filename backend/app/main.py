@@ -8,19 +8,28 @@ Trade-offs made for MVP:
 3. No authentication (documented as out of scope)
 """
 
-from fastapi import FastAPI, HTTPException, Query, UploadFile, File
+from fastapi import FastAPI, HTTPException, Header, Query, UploadFile, File
 from fastapi.middleware.cors import CORSMiddleware
 from datetime import datetime
 from typing import Optional
 
+from prisma.models import Message, User
+
+from app.compression import CompressionMiddleware
 from app.config import get_settings
 from app.database import db, connect_db, disconnect_db
-from app.gemini import translate_text, generate_summary, get_supported_languages
+from app.drafts import draft_translator, text_hash
+from app.gemini import translate_text, generate_summary, get_supported_languages, model_router
+from app.idempotency import IdempotencyStore
+from app.inbox import record_message, preview_field, encode_inbox_cursor, decode_inbox_cursor
+from app.projection import parse_fields, select_fields, projected_actions, json_response
 from app.schemas import (
     UserCreate, UserResponse, UsersListResponse,
     ConversationCreate, ConversationResponse,
+    InboxConversation, InboxResponse,
     MessageCreate, MessageResponse, MessagesListResponse,
-    SearchResponse, SearchResult,
+    MessageDraftRequest, MessageDraftResponse,
+    SearchResponse, SearchResult, SEARCH_RESULT_COLUMNS,
     SummaryRequest, SummaryResponse,
     AudioUploadResponse,
     LanguagesResponse, LanguageOption,
@@ -28,6 +37,12 @@ from app.schemas import (
 
 settings = get_settings()
 
+# Recent Idempotency-Key responses, so client retries never repeat Gemini calls
+idempotency_store = IdempotencyStore(
+    max_keys=settings.IDEMPOTENCY_MAX_KEYS,
+    ttl_seconds=settings.IDEMPOTENCY_TTL_SECONDS,
+)
+
 # Initialize FastAPI app
 app = FastAPI(
     title=settings.APP_NAME,
@@ -46,6 +61,11 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress large responses (gzip, or brotli when installed) for mobile clients
+app.add_middleware(CompressionMiddleware, minimum_size=settings.COMPRESSION_MINIMUM_SIZE)
+
+FIELDS_DESCRIPTION = "Comma-separated fields to return (default: all)"
+
 
 # ============ Lifecycle Events ============
 
@@ -69,6 +89,15 @@ async def health_check():
     return {"status": "healthy", "timestamp": datetime.utcnow().isoformat()}
 
 
+@app.get("/routing/stats")
+async def routing_stats():
+    """
+    Gemini model routing state: per-model latency / error statistics
+    and the most recent routing decisions.
+    """
+    return model_router.snapshot()
+
+
 # ============ Language Endpoints ============
 
 @app.get("/languages", response_model=LanguagesResponse)
@@ -118,13 +147,27 @@ async def create_user(data: UserCreate):
 
 
 @app.get("/users", response_model=UsersListResponse)
-async def get_users(role: Optional[str] = Query(None, pattern="^(doctor|patient)$")):
+async def get_users(
+    role: Optional[str] = Query(None, pattern="^(doctor|patient)$"),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION)
+):
     """
     Get list of users. Optionally filter by role (doctor or patient).
     """
+    projection = parse_fields(fields, UserResponse.model_fields)
     where_clause = {"role": role} if role else {}
-    users = await db.user.find_many(where=where_clause, order={"createdAt": "desc"})
-    return UsersListResponse(users=users)
+    users = await projected_actions(User, db, projection).find_many(
+        where=where_clause, order={"createdAt": "desc"}
+    )
+    
+    if projection:
+        return json_response(
+            UsersListResponse.model_construct(
+                users=[UserResponse.model_construct(**u.model_dump()) for u in users]
+            ),
+            exclude_unset=True
+        )
+    return json_response(UsersListResponse(users=users))
 
 
 @app.get("/users/{unique_id}", response_model=UserResponse)
@@ -189,19 +232,92 @@ async def get_conversation(conversation_id: str):
     return conversation
 
 
+@app.get("/users/{user_id}/conversations", response_model=InboxResponse)
+async def get_user_conversations(
+    user_id: str,
+    limit: int = Query(20, ge=1, le=100, description="Page size"),
+    cursor: Optional[str] = Query(None, description="Cursor from a previous page's nextCursor")
+):
+    """
+    List a user's conversations, most recent activity first.
+    
+    The preview is in the viewer's language: their own original text, or the
+    translation of the other party's message, as in the chat view.
+    
+    Last message preview, message count and last activity are denormalized
+    onto Conversation by send_message, so each page is a single query on the
+    (doctorId|patientId, lastActivityAt, id) index with no Message lookups.
+    
+    Trade-off: Keyset pagination instead of offsets so deep pages stay cheap
+    for doctors with thousands of sessions; clients can only page forward.
+    """
+    user = await db.user.find_unique(where={"id": user_id})
+    
+    if not user:
+        raise HTTPException(404, f"User not found with ID: {user_id}")
+    
+    owner_field = "doctorId" if user.role == "doctor" else "patientId"
+    where_clause = {owner_field: user_id}
+    
+    if cursor:
+        last_activity, last_id = decode_inbox_cursor(cursor)
+        where_clause["OR"] = [
+            {"lastActivityAt": {"lt": last_activity}},
+            {"lastActivityAt": last_activity, "id": {"lt": last_id}},
+        ]
+    
+    # Fetch one extra row to know whether another page exists
+    conversations = await db.conversation.find_many(
+        where=where_clause,
+        order=[{"lastActivityAt": "desc"}, {"id": "desc"}],
+        take=limit + 1
+    )
+    
+    has_more = len(conversations) > limit
+    conversations = conversations[:limit]
+    
+    preview = preview_field(user.role)
+    return InboxResponse(
+        conversations=[
+            InboxConversation.model_validate({
+                **c.model_dump(),
+                "lastMessagePreview": getattr(c, preview),
+            })
+            for c in conversations
+        ],
+        nextCursor=encode_inbox_cursor(conversations[-1]) if has_more else None
+    )
+
+
 # ============ Message Endpoints ============
 
 @app.post("/message", response_model=MessageResponse)
-async def send_message(data: MessageCreate):
+async def send_message(
+    data: MessageCreate,
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key", max_length=255)
+):
     """
     Send a message in a conversation.
     
     The message is automatically translated from the sender's language
     to the recipient's language using Gemini AI.
     
+    If a draft translation of the same text was requested via /message/draft,
+    it is reused and no Gemini call is made on the send path.
+    
+    Send an Idempotency-Key header to make retries safe: a repeated key returns
+    the original message instead of translating and inserting it again.
+    
     Trade-off: Synchronous translation for simplicity. 
     For production, consider background processing for long texts.
     """
+    return await idempotency_store.run(
+        "message", idempotency_key, data, lambda: create_message(data)
+    )
+
+
+async def create_message(data: MessageCreate):
+    """Translate and store a message, updating the conversation's inbox fields."""
     # Get conversation to determine languages
     conversation = await db.conversation.find_unique(
         where={"id": data.conversationId}
@@ -211,35 +327,64 @@ async def send_message(data: MessageCreate):
         raise HTTPException(404, "Conversation not found")
     
     # Determine source and target languages based on role
-    if data.role == "doctor":
-        source_lang = conversation.doctorLanguage
-        target_lang = conversation.patientLanguage
-    else:  # patient
-        source_lang = conversation.patientLanguage
-        target_lang = conversation.doctorLanguage
-    
-    # Translate the message
-    translated_text = await translate_text(data.text, source_lang, target_lang)
-    
-    # Save message to database
-    message = await db.message.create(
-        data={
-            "conversationId": data.conversationId,
-            "role": data.role,
-            "originalText": data.text,
-            "translatedText": translated_text,
-            "sourceLanguage": source_lang,
-            "targetLanguage": target_lang,
-        }
-    )
+    source_lang, target_lang = get_message_languages(conversation, data.role)
+    
+    # Reuse the draft translated while the user was typing, if the text matches
+    translated_text = await draft_translator.consume(data.conversationId, data.role, data.text)
+    if translated_text is None:
+        translated_text = await translate_text(data.text, source_lang, target_lang)
+    
+    # Save message and refresh the conversation's inbox fields atomically
+    async with db.tx() as transaction:
+        message = await transaction.message.create(
+            data={
+                "conversationId": data.conversationId,
+                "role": data.role,
+                "originalText": data.text,
+                "translatedText": translated_text,
+                "sourceLanguage": source_lang,
+                "targetLanguage": target_lang,
+            }
+        )
+        await record_message(transaction, message)
     
     return message
 
 
+@app.post("/message/draft", response_model=MessageDraftResponse)
+async def draft_message(data: MessageDraftRequest):
+    """
+    Speculatively translate a message while it is still being typed.
+    
+    The client calls this debounced as the text stabilizes. A newer draft for
+    the same conversation and role cancels the older one, and the latest
+    completed translation is kept so /message can reuse it on send.
+    """
+    conversation = await db.conversation.find_unique(
+        where={"id": data.conversationId}
+    )
+    
+    if not conversation:
+        raise HTTPException(404, "Conversation not found")
+    
+    source_lang, target_lang = get_message_languages(conversation, data.role)
+    status, translated_text = await draft_translator.draft(
+        data.conversationId, data.role, data.text, source_lang, target_lang
+    )
+    
+    return MessageDraftResponse(
+        conversationId=data.conversationId,
+        textHash=text_hash(data.text),
+        status=status,
+        translatedText=translated_text
+    )
+
+
 @app.get("/messages/{conversation_id}", response_model=MessagesListResponse)
 async def get_messages(
     conversation_id: str,
-    after: Optional[str] = Query(None, description="Get messages after this message ID (for polling)")
+    after: Optional[str] = Query(None, description="Get messages after this message ID (for polling)"),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION)
 ):
     """
     Get messages for a conversation.
@@ -247,9 +392,13 @@ async def get_messages(
     Supports polling by providing 'after' parameter with the last known message ID.
     Client should poll this endpoint every 1-2 seconds for near real-time updates.
     
+    Use 'fields' to fetch only the columns the client renders.
+    
     Trade-off: Polling instead of WebSockets for simplicity.
     For production, consider WebSockets or Server-Sent Events.
     """
+    projection = parse_fields(fields, MessageResponse.model_fields)
+    
     # Verify conversation exists
     conversation = await db.conversation.find_unique(
         where={"id": conversation_id}
@@ -268,7 +417,10 @@ async def get_messages(
             where_clause["createdAt"] = {"gt": reference_msg.createdAt}
     
     # Fetch messages ordered by creation time
-    messages = await db.message.find_many(
+    # 'id' is always selected because polling needs lastMessageId
+    messages = await projected_actions(
+        Message, db, select_fields(projection, required={"id"})
+    ).find_many(
         where=where_clause,
         order={"createdAt": "asc"}
     )
@@ -276,10 +428,21 @@ async def get_messages(
     # Get last message ID for polling
     last_id = messages[-1].id if messages else None
     
-    return MessagesListResponse(
+    if projection:
+        return json_response(
+            MessagesListResponse.model_construct(
+                messages=[
+                    MessageResponse.model_construct(**m.model_dump(include=projection))
+                    for m in messages
+                ],
+                lastMessageId=last_id
+            ),
+            exclude_unset=True
+        )
+    return json_response(MessagesListResponse(
         messages=messages,
         lastMessageId=last_id
-    )
+    ))
 
 
 # ============ Search Endpoint ============
@@ -287,7 +450,8 @@ async def get_messages(
 @app.get("/search", response_model=SearchResponse)
 async def search_messages(
     q: str = Query(..., min_length=1, description="Search query"),
-    conversation_id: Optional[str] = Query(None, description="Limit search to specific conversation")
+    conversation_id: Optional[str] = Query(None, description="Limit search to specific conversation"),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION)
 ):
     """
     Search messages by keyword.
@@ -298,6 +462,7 @@ async def search_messages(
     - PostgreSQL full-text search with ts_vector
     - Elasticsearch for advanced search features
     """
+    projection = parse_fields(fields, SearchResult.model_fields)
     # Build where clause
     # Using contains for case-insensitive search
     # Trade-off: OR queries with contains are not efficient at scale
@@ -311,12 +476,30 @@ async def search_messages(
     if conversation_id:
         where_clause["conversationId"] = conversation_id
     
-    messages = await db.message.find_many(
+    # SearchResult exposes Message.id as messageId
+    selected = select_fields(projection, SEARCH_RESULT_COLUMNS)
+    messages = await projected_actions(Message, db, selected).find_many(
         where=where_clause,
         order={"createdAt": "desc"},
         take=50  # Limit results for MVP
     )
     
+    if projection:
+        return json_response(
+            SearchResponse.model_construct(
+                query=q,
+                results=[
+                    SearchResult.model_construct(**{
+                        field: getattr(msg, SEARCH_RESULT_COLUMNS.get(field, field))
+                        for field in projection
+                    })
+                    for msg in messages
+                ],
+                totalCount=len(messages)
+            ),
+            exclude_unset=True
+        )
+    
     results = [
         SearchResult(
             messageId=msg.id,
@@ -329,26 +512,37 @@ async def search_messages(
         for msg in messages
     ]
     
-    return SearchResponse(
+    return json_response(SearchResponse(
         query=q,
         results=results,
         totalCount=len(results)
-    )
+    ))
 
 
 # ============ Summary Endpoint ============
 
 @app.post("/summary", response_model=SummaryResponse)
-async def create_summary(data: SummaryRequest):
+async def create_summary(
+    data: SummaryRequest,
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key", max_length=255)
+):
     """
     Generate an AI-powered summary of a conversation.
     
     The summary is generated using Gemini and stored in the conversation record.
-    Subsequent calls will regenerate the summary (not cached).
+    Subsequent calls will regenerate the summary (not cached), unless they
+    repeat an Idempotency-Key, which returns the original summary.
     
     Trade-off: No caching - regenerates each time. 
     For production, consider caching and incremental updates.
     """
+    return await idempotency_store.run(
+        "summary", idempotency_key, data, lambda: summarize_conversation(data)
+    )
+
+
+async def summarize_conversation(data: SummaryRequest) -> SummaryResponse:
+    """Generate and store a conversation summary."""
     # Get conversation with messages
     conversation = await db.conversation.find_unique(
         where={"id": data.conversationId},
@@ -0,0 +1,97 @@
+"""
+Field projection (`fields=` query parameter) pushed down into Prisma queries.
+Prisma Client Python selects exactly the fields of the model class it parses
+results into, so projected queries run through runtime-built partial models
+(the same mechanism as generated partial types) and only fetch those columns.
+Trade-off: Scalar fields only; relations are never included in projections.
+"""
+
+from functools import lru_cache
+from typing import Iterable, Optional, Type
+
+from fastapi import HTTPException
+from fastapi.responses import Response
+from pydantic import BaseModel, create_model
+
+
+def parse_fields(fields: Optional[str], allowed: Iterable[str]) -> Optional[frozenset[str]]:
+    """
+    Parse a comma-separated `fields=` value.
+
+    Returns None when no projection was requested. Raises 400 for unknown fields.
+    """
+    if fields is None:
+        return None
+
+    requested = frozenset(f.strip() for f in fields.split(",") if f.strip())
+    unknown = requested - set(allowed)
+    if not requested or unknown:
+        raise HTTPException(
+            400,
+            f"Invalid fields: {', '.join(sorted(unknown)) or '(empty)'}. "
+            f"Allowed: {', '.join(sorted(allowed))}"
+        )
+    return requested
+
+
+def select_fields(
+    projection: Optional[frozenset[str]],
+    columns: Optional[dict[str, str]] = None,
+    required: Iterable[str] = (),
+) -> Optional[frozenset[str]]:
+    """
+    Translate requested response fields into the model fields to select.
+
+    `columns` maps response fields that are named differently on the model
+    (e.g. {"messageId": "id"}); `required` fields are always selected because
+    the endpoint itself reads them. Returns None (select everything) when no
+    projection was requested.
+    """
+    if projection is None:
+        return None
+    columns = columns or {}
+    return frozenset(columns.get(field, field) for field in projection) | frozenset(required)
+
+
+@lru_cache(maxsize=128)
+def partial_model(model: Type[BaseModel], fields: frozenset[str]) -> Type[BaseModel]:
+    """Build (once per field set) a Prisma partial model selecting only the given fields."""
+    # Imported here so the parsing helpers above work without a generated client
+    from prisma import bases
+
+    name = model.__prisma_model__
+    base = getattr(bases, f"Base{name}")
+    return create_model(
+        f"{name}Projection_{'_'.join(sorted(fields))}",
+        __base__=base,
+        **{
+            field: (model.model_fields[field].annotation, ...)
+            for field in fields
+        },
+    )
+
+
+def projected_actions(model: Type[BaseModel], db, fields: Optional[frozenset[str]]):
+    """
+    Return the Prisma actions for a model, restricted to the given fields.
+
+    Example: projected_actions(Message, db, {"id", "originalText"}).find_many(...)
+    """
+    if fields is None:
+        return getattr(db, model.__prisma_model__.lower())
+    return partial_model(model, fields).prisma(db)
+
+
+def json_response(content: BaseModel, exclude_unset: bool = False) -> Response:
+    """
+    Serialize a response model straight to JSON bytes with Pydantic's Rust encoder.
+
+    Skips FastAPI's jsonable_encoder + json.dumps pass, which dominates the
+    cost of large message lists. Use exclude_unset=True for projected responses
+    built with model_construct, so only the requested fields are emitted.
+    """
+    return Response(
+        content=content.model_dump_json(exclude_unset=exclude_unset),
+        media_type="application/json",
+    )
+
@@ -0,0 +1,199 @@
+"""
+Latency-aware Gemini model routing.
+Statistics are kept per (route, model), so long translations and summaries
+never skew the latency a model is ranked by for short chat turns.
+Trade-off: In-process rolling statistics per worker. Good enough to steer traffic
+away from a degraded model quickly; share stats via Redis if running many workers.
+"""
+
+import time
+from collections import deque
+from dataclasses import dataclass, field, asdict
+from datetime import datetime
+from typing import Optional
+
+from app.config import Settings
+
+# Weight of the newest sample in the rolling latency / error averages
+EWMA_ALPHA = 0.2
+
+# Floor on the success rate used to penalise latency, so the ranking stays finite
+MIN_SUCCESS_RATE = 0.05
+
+# Number of recent routing decisions kept for inspection
+DECISION_HISTORY_SIZE = 200
+
+
+@dataclass
+class ModelStats:
+    """Rolling latency and error statistics for a single model."""
+    calls: int = 0
+    errors: int = 0
+    latency_ms: Optional[float] = None  # EWMA, None until the first call completes
+    error_rate: float = 0.0  # EWMA of failures (0.0 - 1.0)
+    degraded_until: float = 0.0  # time.monotonic() deadline; 0 when healthy
+
+    def record(self, latency_ms: float, ok: bool) -> None:
+        if ok and self.degraded_until and time.monotonic() >= self.degraded_until:
+            # Successful probe after a cooldown: reseed from this sample instead of
+            # letting the EWMA crawl back over several cooldown cycles
+            self.latency_ms = None
+            self.error_rate = 0.0
+        self.calls += 1
+        if not ok:
+            self.errors += 1
+        else:
+            # Failed calls often time out or fail fast; neither reflects real latency
+            if self.latency_ms is None:
+                self.latency_ms = latency_ms
+            else:
+                self.latency_ms += EWMA_ALPHA * (latency_ms - self.latency_ms)
+        self.error_rate += EWMA_ALPHA * ((0.0 if ok else 1.0) - self.error_rate)
+
+
+@dataclass
+class RoutingDecision:
+    """A single routing choice and its outcome."""
+    purpose: str
+    route: str
+    reason: str
+    candidates: list[str]
+    model: Optional[str] = None  # Model that finally served the request
+    attempts: list[str] = field(default_factory=list)
+    latency_ms: Optional[float] = None
+    ok: bool = False
+    timestamp: str = field(default_factory=lambda: datetime.utcnow().isoformat())
+
+
+class ModelRouter:
+    """
+    Picks a Gemini model per request from purpose, text length, language pair
+    and live per-model statistics.
+
+    Short chat turns go to whichever healthy candidate is currently fastest;
+    translations and summaries go to the first healthy candidate in the
+    configured preference order. Degraded models are skipped for a cooldown
+    period and then probed again.
+    """
+
+    def __init__(self, settings: Settings):
+        self.settings = settings
+        self.routes = settings.gemini_routes
+        self.complex_languages = settings.gemini_complex_languages
+        self.max_latency_ms = settings.gemini_max_latency_ms
+        self.stats: dict[tuple[str, str], ModelStats] = {}
+        self.decisions: deque[RoutingDecision] = deque(maxlen=DECISION_HISTORY_SIZE)
+
+    def _stats(self, route: str, model: str) -> ModelStats:
+        return self.stats.setdefault((route, model), ModelStats())
+
+    def is_healthy(self, route: str, model: str) -> bool:
+        """A model is healthy on a route unless it is inside a degradation cooldown."""
+        return time.monotonic() >= self._stats(route, model).degraded_until
+
+    def _chat_rank(self, model: str) -> tuple[int, float]:
+        """
+        Sort key for chat candidates, lower is better.
+
+        Untried models come first so each one gets sampled once; models that
+        have only ever failed come last. The rest are ranked by latency scaled
+        up by their error rate, i.e. roughly the expected time to a success.
+        """
+        stats = self._stats("chat", model)
+        if stats.latency_ms is None:
+            return (2, 0.0) if stats.errors else (0, 0.0)
+        return (1, stats.latency_ms / max(1.0 - stats.error_rate, MIN_SUCCESS_RATE))
+
+    def classify(
+        self,
+        purpose: str,
+        text: str,
+        source_lang: Optional[str] = None,
+        target_lang: Optional[str] = None,
+    ) -> tuple[str, str]:
+        """Return (route, reason) for a request."""
+        if purpose == "summary":
+            return "summary", "summary"
+        if len(text) > self.settings.GEMINI_SHORT_TEXT_CHARS:
+            return "translation", f"long text ({len(text)} chars)"
+        if {source_lang, target_lang} & self.complex_languages:
+            return "translation", f"complex language pair {source_lang}->{target_lang}"
+        return "chat", f"short text ({len(text)} chars)"
+
+    def route(
+        self,
+        purpose: str,
+        text: str,
+        source_lang: Optional[str] = None,
+        target_lang: Optional[str] = None,
+    ) -> RoutingDecision:
+        """Choose an ordered list of candidate models for a request and record the decision."""
+        route, reason = self.classify(purpose, text, source_lang, target_lang)
+        configured = self.routes.get(route) or self.routes["translation"]
+
+        healthy = [m for m in configured if self.is_healthy(route, m)]
+        degraded = [m for m in configured if m not in healthy]
+
+        if route == "chat":
+            healthy.sort(key=self._chat_rank)
+            reason += ", lowest expected latency"
+
+        if degraded:
+            reason += f", skipping degraded {','.join(degraded)}"
+
+        # Degraded models stay at the end as a last resort rather than failing outright
+        decision = RoutingDecision(
+            purpose=purpose,
+            route=route,
+            reason=reason,
+            candidates=healthy + degraded,
+        )
+        self.decisions.append(decision)
+        return decision
+
+    def record(self, decision: RoutingDecision, model: str, latency_ms: float, ok: bool) -> None:
+        """Record the outcome of one attempt against a model on the decision's route."""
+        stats = self._stats(decision.route, model)
+        stats.record(latency_ms, ok)
+
+        max_latency_ms = self.max_latency_ms.get(decision.route, self.settings.GEMINI_TRANSLATION_MAX_LATENCY_MS)
+        if (
+            stats.error_rate > self.settings.GEMINI_MAX_ERROR_RATE
+            or (stats.latency_ms or 0.0) > max_latency_ms
+        ):
+            stats.degraded_until = time.monotonic() + self.settings.GEMINI_DEGRADED_COOLDOWN_SECONDS
+        else:
+            stats.degraded_until = 0.0
+
+        decision.attempts.append(model)
+        decision.latency_ms = latency_ms
+        decision.ok = ok
+        if ok:
+            decision.model = model
+
+        if self.settings.DEBUG:
+            print(
+                f"Gemini routing: {decision.route} -> {model} "
+                f"({'ok' if ok else 'error'}, {latency_ms:.0f} ms; {decision.reason})"
+            )
+
+    def snapshot(self) -> dict:
+        """Current per-model statistics and recent decisions, newest first."""
+        return {
+            "routes": self.routes,
+            "models": {
+                route: {
+                    model: {
+                        "calls": s.calls,
+                        "errors": s.errors,
+                        "latencyMs": s.latency_ms,
+                        "errorRate": round(s.error_rate, 4),
+                        "healthy": self.is_healthy(route, model),
+                    }
+                    for (stats_route, model), s in self.stats.items()
+                    if stats_route == route
+                }
+                for route in self.routes
+            },
+            "recentDecisions": [asdict(d) for d in reversed(self.decisions)],
+        }
@@ -37,6 +37,9 @@ class UsersListResponse(BaseModel):
 
 # ============ Conversation Schemas ============
 
+# Length of the last-message preview stored on each conversation
+MESSAGE_PREVIEW_LENGTH = 120
+
 class ConversationCreate(BaseModel):
     """Request schema for creating a new conversation."""
     doctorId: str = Field(..., description="Doctor user ID")
@@ -53,6 +56,11 @@ class ConversationResponse(BaseModel):
     doctorLanguage: str
     patientLanguage: str
     summary: Optional[str] = None
+    messageCount: int = 0
+    doctorPreview: Optional[str] = None
+    patientPreview: Optional[str] = None
+    lastMessageRole: Optional[str] = None
+    lastActivityAt: Optional[datetime] = None
     createdAt: datetime
     updatedAt: datetime
 
@@ -60,6 +68,29 @@ class ConversationResponse(BaseModel):
         from_attributes = True
 
 
+class InboxConversation(BaseModel):
+    """Inbox entry for a conversation, built from denormalized columns only."""
+    id: str
+    doctorId: str
+    patientId: str
+    doctorLanguage: str
+    patientLanguage: str
+    messageCount: int
+    lastMessagePreview: Optional[str] = None  # In the viewer's language
+    lastMessageRole: Optional[str] = None
+    lastActivityAt: datetime
+    createdAt: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class InboxResponse(BaseModel):
+    """Response schema for a user's conversation inbox with keyset pagination."""
+    conversations: list[InboxConversation]
+    nextCursor: Optional[str] = None  # Pass back as 'cursor' to fetch the next page
+
+
 # ============ Message Schemas ============
 
 class MessageCreate(BaseModel):
@@ -69,6 +100,21 @@ class MessageCreate(BaseModel):
     text: str = Field(..., min_length=1, description="Message text in sender's language")
 
 
+class MessageDraftRequest(BaseModel):
+    """Request schema for speculatively translating text while it is being typed."""
+    conversationId: str = Field(..., description="ID of the conversation")
+    role: str = Field(..., pattern="^(doctor|patient)$", description="Sender role: 'doctor' or 'patient'")
+    text: str = Field(..., min_length=1, description="Current draft text in sender's language")
+
+
+class MessageDraftResponse(BaseModel):
+    """Response schema for a draft translation."""
+    conversationId: str
+    textHash: str
+    status: str  # "ready", "superseded" (a newer draft replaced this one) or "failed" (translation error)
+    translatedText: Optional[str] = None
+
+
 class MessageResponse(BaseModel):
     """Response schema for message data."""
     id: str
@@ -105,6 +151,10 @@ class SearchResult(BaseModel):
         from_attributes = True
 
 
+# SearchResult fields stored under a different Message field
+SEARCH_RESULT_COLUMNS = {"messageId": "id"}
+
+
 class SearchResponse(BaseModel):
     """Response schema for search endpoint."""
     query: str
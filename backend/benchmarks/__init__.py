@@ -0,0 +1 @@
+# Synthetic data seeding and query benchmarks for the Prisma data layer
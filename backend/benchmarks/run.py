@@ -0,0 +1,358 @@
+"""
+Query-level benchmark for the data-access patterns in app/main.py.
+
+For each dataset size the runner seeds the database up to that size, times
+every pattern through Prisma (the same calls the endpoints make), captures an
+EXPLAIN ANALYZE plan for the equivalent SQL, and finally prints scaling curves.
+Reports are written as JSON so runs can be compared across schema and index
+changes with --compare.
+
+Trade-off: Patterns are mirrored here rather than calling the endpoints, so
+Gemini is never hit and the benchmark client can run without query timeouts.
+Keep them in sync when the queries in app/main.py change.
+
+Usage (from backend/, against a throwaway DATABASE_URL):
+    python -m benchmarks.run --sizes 10000,100000,1000000 --output before.json
+    python -m benchmarks.run --sizes 10000,100000,1000000 --compare before.json
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import random
+import statistics
+import subprocess
+import time
+from datetime import datetime
+from typing import Awaitable, Callable, Optional
+
+from prisma import Prisma
+
+from benchmarks.seed import PHRASES, seed
+
+# Users scale with messages so 10M messages comes with 100k users
+MESSAGES_PER_USER = 100
+MIN_USERS = 100
+
+
+class Pattern:
+    """A data-access pattern: a Prisma call to time and the SQL it should plan like."""
+
+    def __init__(
+        self,
+        name: str,
+        run: Callable[[Prisma, dict], Awaitable],
+        sql: str,
+        params: Callable[[dict], list],
+    ):
+        self.name = name
+        self.run = run
+        self.sql = sql
+        self.params = params
+
+
+# ============ Patterns (mirror app/main.py) ============
+
+async def search_hit(db: Prisma, sample: dict):
+    # search_messages with a term that occurs in the data
+    q = sample["term"]
+    return await db.message.find_many(
+        where={"OR": [
+            {"originalText": {"contains": q, "mode": "insensitive"}},
+            {"translatedText": {"contains": q, "mode": "insensitive"}},
+        ]},
+        order={"createdAt": "desc"},
+        take=50,
+    )
+
+
+async def search_miss(db: Prisma, sample: dict):
+    # search_messages with a term that never matches: worst case, scans everything
+    q = "zzqx-no-match"
+    return await db.message.find_many(
+        where={"OR": [
+            {"originalText": {"contains": q, "mode": "insensitive"}},
+            {"translatedText": {"contains": q, "mode": "insensitive"}},
+        ]},
+        order={"createdAt": "desc"},
+        take=50,
+    )
+
+
+async def messages_initial(db: Prisma, sample: dict):
+    # get_messages without 'after': full history load when a chat opens
+    await db.conversation.find_unique(where={"id": sample["conversation_id"]})
+    return await db.message.find_many(
+        where={"conversationId": sample["conversation_id"]},
+        order={"createdAt": "asc"},
+    )
+
+
+async def messages_poll(db: Prisma, sample: dict):
+    # get_messages with 'after' = latest message: the 2-second polling steady state
+    await db.conversation.find_unique(where={"id": sample["conversation_id"]})
+    reference = await db.message.find_unique(where={"id": sample["last_message_id"]})
+    return await db.message.find_many(
+        where={"conversationId": sample["conversation_id"], "createdAt": {"gt": reference.createdAt}},
+        order={"createdAt": "asc"},
+    )
+
+
+async def create_user_id(db: Prisma, sample: dict):
+    # create_user ID allocation: load all users of the role, then probe for a free ID
+    existing = await db.user.find_many(where={"role": "patient"})
+    next_number = len(existing) + 1
+    while await db.user.find_unique(where={"uniqueId": f"PAT{next_number:03d}"}):
+        next_number += 1
+    return next_number
+
+
+async def summary_transcript(db: Prisma, sample: dict):
+    # create_summary transcript load (Gemini call excluded)
+    return await db.conversation.find_unique(
+        where={"id": sample["conversation_id"]},
+        include={"messages": {"order_by": {"createdAt": "asc"}}},
+    )
+
+
+async def users_list(db: Prisma, sample: dict):
+    # get_users filtered by role
+    return await db.user.find_many(where={"role": "doctor"}, order={"createdAt": "desc"})
+
+
+async def inbox_page(db: Prisma, sample: dict):
+    # get_user_conversations first page for the doctor with the most conversations
+    return await db.conversation.find_many(
+        where={"doctorId": sample["doctor_id"]},
+        order=[{"lastActivityAt": "desc"}, {"id": "desc"}],
+        take=21,
+    )
+
+
+SEARCH_SQL = (
+    'SELECT * FROM "Message" WHERE ("originalText" ILIKE $1 OR "translatedText" ILIKE $1) '
+    'ORDER BY "createdAt" DESC LIMIT 50'
+)
+
+PATTERNS = [
+    Pattern("search_hit", search_hit, SEARCH_SQL, lambda s: [f"%{s['term']}%"]),
+    Pattern("search_miss", search_miss, SEARCH_SQL, lambda s: ["%zzqx-no-match%"]),
+    Pattern(
+        "messages_initial", messages_initial,
+        'SELECT * FROM "Message" WHERE "conversationId" = $1 ORDER BY "createdAt" ASC',
+        lambda s: [s["conversation_id"]],
+    ),
+    Pattern(
+        "messages_poll", messages_poll,
+        'SELECT * FROM "Message" WHERE "conversationId" = $1 AND "createdAt" > '
+        '(SELECT "createdAt" FROM "Message" WHERE id = $2) ORDER BY "createdAt" ASC',
+        lambda s: [s["conversation_id"], s["last_message_id"]],
+    ),
+    Pattern(
+        "create_user_id", create_user_id,
+        'SELECT * FROM "User" WHERE role = \'patient\'',
+        lambda s: [],
+    ),
+    Pattern(
+        "summary_transcript", summary_transcript,
+        'SELECT * FROM "Message" WHERE "conversationId" = $1 ORDER BY "createdAt" ASC',
+        lambda s: [s["conversation_id"]],
+    ),
+    Pattern(
+        "users_list", users_list,
+        'SELECT * FROM "User" WHERE role = \'doctor\' ORDER BY "createdAt" DESC',
+        lambda s: [],
+    ),
+    Pattern(
+        "inbox_page", inbox_page,
+        'SELECT * FROM "Conversation" WHERE "doctorId" = $1 '
+        'ORDER BY "lastActivityAt" DESC, id DESC LIMIT 21',
+        lambda s: [s["doctor_id"]],
+    ),
+]
+
+
+# ============ Measurement ============
+
+async def pick_samples(db: Prisma, rng: random.Random, count: int) -> list[dict]:
+    """
+    Pick inputs: conversations sampled uniformly from the 1000 longest, so
+    transcript patterns measure heavy consultations, and the doctor with the
+    most conversations for the inbox pattern.
+    """
+    rows = await db.query_raw(
+        'SELECT id, "messageCount" FROM "Conversation" '
+        'ORDER BY "messageCount" DESC LIMIT 1000'
+    )
+    busiest = await db.query_raw(
+        'SELECT "doctorId", COUNT(*) AS count FROM "Conversation" '
+        'GROUP BY "doctorId" ORDER BY count DESC LIMIT 1'
+    )
+    if not rows or not busiest:
+        raise SystemExit("No conversations found; seeding must have failed")
+
+    samples = []
+    for row in rng.sample(rows, min(count, len(rows))):
+        last = await db.message.find_first(
+            where={"conversationId": row["id"]},
+            order={"createdAt": "desc"},
+        )
+        language = rng.choice(list(PHRASES))
+        phrase = rng.choice(PHRASES[language])
+        samples.append({
+            "conversation_id": row["id"],
+            "doctor_id": busiest[0]["doctorId"],
+            "last_message_id": last.id,
+            # A word-ish fragment of a real phrase, like a user would type
+            "term": phrase.split()[0] if " " in phrase else phrase[:2],
+        })
+    return samples
+
+
+async def explain(db: Prisma, pattern: Pattern, sample: dict) -> dict:
+    """Run EXPLAIN ANALYZE for a pattern's SQL and return the JSON plan."""
+    rows = await db.query_raw(
+        f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {pattern.sql}",
+        *pattern.params(sample),
+    )
+    plan = rows[0]["QUERY PLAN"]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return plan[0]
+
+
+async def measure(db: Prisma, samples: list[dict], repeat: int) -> dict:
+    """Time every pattern over the samples and capture one plan each."""
+    results = {}
+    for pattern in PATTERNS:
+        # Warm up caches and the query engine once so the first sample isn't an outlier
+        await pattern.run(db, samples[0])
+
+        timings = []
+        for _ in range(repeat):
+            for sample in samples:
+                start = time.perf_counter()
+                await pattern.run(db, sample)
+                timings.append((time.perf_counter() - start) * 1000)
+
+        plan = await explain(db, pattern, samples[0])
+        timings.sort()
+        results[pattern.name] = {
+            "median_ms": statistics.median(timings),
+            "p95_ms": timings[min(len(timings) - 1, int(len(timings) * 0.95))],
+            "samples": len(timings),
+            "plan_execution_ms": plan.get("Execution Time"),
+            "plan_root": plan["Plan"]["Node Type"],
+            "plan": plan,
+        }
+        print(f"  {pattern.name:<20} median {results[pattern.name]['median_ms']:9.2f} ms  "
+              f"({results[pattern.name]['plan_root']})")
+    return results
+
+
+# ============ Reporting ============
+
+def scaling_exponent(sizes: list[int], times: list[float]) -> Optional[float]:
+    """Least-squares slope of log(time) vs log(size): ~0 flat, ~1 linear, >1 superlinear."""
+    points = [(math.log(s), math.log(t)) for s, t in zip(sizes, times) if t > 0]
+    if len(points) < 2:
+        return None
+    mean_x = statistics.fmean(x for x, _ in points)
+    mean_y = statistics.fmean(y for _, y in points)
+    denominator = sum((x - mean_x) ** 2 for x, _ in points)
+    if denominator == 0:
+        return None
+    return sum((x - mean_x) * (y - mean_y) for x, y in points) / denominator
+
+
+def print_report(report: dict, baseline: Optional[dict] = None) -> None:
+    """Print median latency per pattern and size, with scaling exponents."""
+    runs = report["runs"]
+    sizes = [run["messages"] for run in runs]
+    baseline_runs = {run["messages"]: run for run in (baseline or {}).get("runs", [])}
+
+    header = f"{'pattern':<20}" + "".join(f"{size:>14,}" for size in sizes) + f"{'exponent':>10}"
+    print("\nMedian latency (ms) by message count")
+    print(header)
+    print("-" * len(header))
+    for pattern in PATTERNS:
+        times = [run["results"][pattern.name]["median_ms"] for run in runs]
+        row = f"{pattern.name:<20}" + "".join(f"{t:>14.2f}" for t in times)
+        exponent = scaling_exponent(sizes, times)
+        row += f"{exponent:>10.2f}" if exponent is not None else f"{'-':>10}"
+        print(row)
+
+        if baseline_runs:
+            deltas = []
+            for run in runs:
+                before = baseline_runs.get(run["messages"], {}).get("results", {}).get(pattern.name)
+                if before and before["median_ms"] > 0:
+                    change = (run["results"][pattern.name]["median_ms"] / before["median_ms"] - 1) * 100
+                    deltas.append(f"{change:>+13.0f}%")
+                else:
+                    deltas.append(f"{'-':>14}")
+            print(f"{'  vs baseline':<20}" + "".join(deltas))
+
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark data-access patterns at several dataset sizes")
+    parser.add_argument("--sizes", default="10000,100000,1000000", help="Comma-separated message counts")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per sample")
+    parser.add_argument("--samples", type=int, default=5, help="Conversations sampled per size")
+    parser.add_argument("--skip-seed", action="store_true", help="Benchmark the database as-is")
+    parser.add_argument("--output", default="benchmark-report.json", help="Where to write the JSON report")
+    parser.add_argument("--compare", help="Previous JSON report to compare against")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    args = parser.parse_args()
+
+    sizes = sorted(int(s) for s in args.sizes.split(",") if s.strip())
+    rng = random.Random(args.seed)
+    report = {
+        "generatedAt": datetime.utcnow().isoformat(),
+        "revision": git_revision(),
+        "runs": [],
+    }
+
+    db = Prisma(http={"timeout": None})
+    await db.connect()
+    try:
+        for size in sizes:
+            users = max(MIN_USERS, size // MESSAGES_PER_USER)
+            if not args.skip_seed:
+                start = time.perf_counter()
+                await seed(db, users=users, messages=size, random_seed=args.seed)
+                print(f"Seeded to {size:,} messages / {users:,} users in {time.perf_counter() - start:.1f}s")
+            await db.execute_raw('ANALYZE "User", "Conversation", "Message"')
+
+            messages = await db.message.count()
+            print(f"Benchmarking at {messages:,} messages")
+            samples = await pick_samples(db, rng, args.samples)
+            report["runs"].append({
+                "messages": messages,
+                "users": await db.user.count(),
+                "results": await measure(db, samples, args.repeat),
+            })
+    finally:
+        await db.disconnect()
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, default=str)
+    print(f"\nReport written to {args.output}")
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+    print_report(report, baseline)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
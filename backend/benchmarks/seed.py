@@ -0,0 +1,277 @@
+"""
+Synthetic dataset generator for local benchmarking.
+Bulk-loads users, conversations and multilingual messages through the
+schema.prisma models. Seeding is incremental: running it again with larger
+targets only tops up the difference, so one database can be grown through
+several benchmark sizes.
+
+Trade-off: Uses Prisma create_many in batches rather than COPY, so the load
+goes through the same client and column mapping as the app. Expect roughly
+tens of thousands of rows per second on a local Postgres.
+
+Usage (from backend/, against a throwaway DATABASE_URL):
+    python -m benchmarks.seed --messages 1000000 --users 10000
+"""
+
+import argparse
+import asyncio
+import random
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from prisma import Prisma
+
+from app.inbox import message_previews
+
+# Aligned medical phrases per language: index i is the same sentence everywhere,
+# so originalText / translatedText pairs look like real translations.
+PHRASES = {
+    "en": [
+        "How are you feeling today?",
+        "I have had a headache for three days.",
+        "Do you have any allergies to medication?",
+        "The pain is worse at night.",
+        "Please take this tablet twice a day after meals.",
+        "I feel dizzy when I stand up.",
+        "We need to run a blood test.",
+        "My chest feels tight when I climb stairs.",
+        "Have you had a fever or chills?",
+        "Come back in two weeks for a follow-up.",
+    ],
+    "es": [
+        "¿Cómo se siente hoy?",
+        "Tengo dolor de cabeza desde hace tres días.",
+        "¿Tiene alergia a algún medicamento?",
+        "El dolor empeora por la noche.",
+        "Tome esta pastilla dos veces al día después de las comidas.",
+        "Me mareo cuando me levanto.",
+        "Necesitamos hacer un análisis de sangre.",
+        "Siento opresión en el pecho al subir escaleras.",
+        "¿Ha tenido fiebre o escalofríos?",
+        "Vuelva en dos semanas para un control.",
+    ],
+    "fr": [
+        "Comment vous sentez-vous aujourd'hui ?",
+        "J'ai mal à la tête depuis trois jours.",
+        "Avez-vous des allergies aux médicaments ?",
+        "La douleur est pire la nuit.",
+        "Prenez ce comprimé deux fois par jour après les repas.",
+        "J'ai des vertiges quand je me lève.",
+        "Nous devons faire une prise de sang.",
+        "J'ai la poitrine serrée quand je monte les escaliers.",
+        "Avez-vous eu de la fièvre ou des frissons ?",
+        "Revenez dans deux semaines pour un suivi.",
+    ],
+    "zh": [
+        "您今天感觉怎么样？",
+        "我头痛已经三天了。",
+        "您对药物过敏吗？",
+        "晚上疼得更厉害。",
+        "请每天饭后服用这片药两次。",
+        "我站起来时会头晕。",
+        "我们需要做一次血液检查。",
+        "我爬楼梯时胸口发紧。",
+        "您有没有发烧或发冷？",
+        "两周后回来复诊。",
+    ],
+    "hi": [
+        "आज आप कैसा महसूस कर रहे हैं?",
+        "मुझे तीन दिनों से सिरदर्द है।",
+        "क्या आपको किसी दवा से एलर्जी है?",
+        "रात में दर्द बढ़ जाता है।",
+        "यह गोली दिन में दो बार खाने के बाद लें।",
+        "खड़े होने पर मुझे चक्कर आता है।",
+        "हमें खून की जांच करनी होगी।",
+        "सीढ़ियां चढ़ते समय मेरी छाती में जकड़न होती है।",
+        "क्या आपको बुखार या ठंड लगी है?",
+        "दो हफ्ते बाद जांच के लिए आइए।",
+    ],
+    "ar": [
+        "كيف تشعر اليوم؟",
+        "أعاني من صداع منذ ثلاثة أيام.",
+        "هل لديك حساسية من أي دواء؟",
+        "الألم يزداد في الليل.",
+        "تناول هذا القرص مرتين يوميًا بعد الوجبات.",
+        "أشعر بالدوار عندما أقف.",
+        "نحتاج إلى إجراء فحص دم.",
+        "أشعر بضيق في صدري عند صعود الدرج.",
+        "هل أصبت بحمى أو قشعريرة؟",
+        "عد بعد أسبوعين للمتابعة.",
+    ],
+}
+
+# Share of users who are doctors
+DOCTOR_RATIO = 0.1
+
+# Rows per create_many call
+DEFAULT_BATCH_SIZE = 5000
+
+
+def make_uuid(rng: random.Random) -> str:
+    return str(uuid.UUID(int=rng.getrandbits(128), version=4))
+
+
+def make_text(rng: random.Random, source: str, target: str) -> tuple[str, str]:
+    """Return (original, translated) built from 1-3 aligned phrases."""
+    picks = [rng.randrange(len(PHRASES["en"])) for _ in range(rng.choice((1, 1, 2, 3)))]
+    original = " ".join(PHRASES[source][i] for i in picks)
+    translated = " ".join(PHRASES[target][i] for i in picks)
+    return original, translated
+
+
+async def seed_users(db: Prisma, rng: random.Random, target: int, batch_size: int) -> None:
+    """Top up users to the target count, keeping the doctor/patient ratio."""
+    existing = await db.user.count()
+    if existing >= target:
+        return
+
+    counts = {
+        role: await db.user.count(where={"role": role})
+        for role in ("doctor", "patient")
+    }
+    batch = []
+    for n in range(existing, target):
+        role = "doctor" if rng.random() < DOCTOR_RATIO else "patient"
+        counts[role] += 1
+        prefix = "DOC" if role == "doctor" else "PAT"
+        batch.append({
+            "id": make_uuid(rng),
+            "name": f"Synthetic {role.title()} {counts[role]}",
+            "role": role,
+            # Same format as create_user, but suffixed so it never collides with real rows
+            "uniqueId": f"{prefix}{counts[role]:03d}S{n}",
+            "language": "en" if role == "doctor" else rng.choice(list(PHRASES)),
+        })
+        if len(batch) >= batch_size:
+            await db.user.create_many(data=batch, skip_duplicates=True)
+            batch = []
+    if batch:
+        await db.user.create_many(data=batch, skip_duplicates=True)
+
+
+async def seed_messages(
+    db: Prisma,
+    rng: random.Random,
+    target: int,
+    messages_per_conversation: int,
+    batch_size: int,
+) -> None:
+    """
+    Top up messages to the target count by adding new conversations.
+
+    Conversation lengths are exponentially distributed around the mean, so a
+    few long consultations sit alongside many short ones. Denormalized inbox
+    columns are filled in the same way send_message would leave them.
+    """
+    existing = await db.message.count()
+    if existing >= target:
+        return
+
+    users = await db.query_raw('SELECT id, role FROM "User"')
+    doctors = [u["id"] for u in users if u["role"] == "doctor"]
+    patients = [u["id"] for u in users if u["role"] == "patient"]
+    if not doctors or not patients:
+        raise SystemExit("Seed users first: need at least one doctor and one patient")
+
+    languages = list(PHRASES)
+    now = datetime.now(timezone.utc)
+    remaining = target - existing
+    conversations, messages = [], []
+
+    async def flush() -> None:
+        nonlocal conversations, messages
+        if conversations:
+            await db.conversation.create_many(data=conversations)
+        for start in range(0, len(messages), batch_size):
+            await db.message.create_many(data=messages[start:start + batch_size])
+        conversations, messages = [], []
+
+    while remaining > 0:
+        count = min(remaining, max(1, int(rng.expovariate(1 / messages_per_conversation))))
+        remaining -= count
+
+        conversation_id = make_uuid(rng)
+        doctor_language = rng.choice(["en", "en", "en", "es", "fr"])
+        patient_language = rng.choice([l for l in languages if l != doctor_language])
+        started = now - timedelta(days=rng.uniform(0, 365))
+        timestamp = started
+        last = None
+
+        for i in range(count):
+            role = "doctor" if i % 2 == 0 else "patient"
+            source, target_lang = (
+                (doctor_language, patient_language) if role == "doctor"
+                else (patient_language, doctor_language)
+            )
+            original, translated = make_text(rng, source, target_lang)
+            timestamp += timedelta(seconds=rng.uniform(5, 120))
+            last = {
+                "id": make_uuid(rng),
+                "conversationId": conversation_id,
+                "role": role,
+                "originalText": original,
+                "translatedText": translated,
+                "sourceLanguage": source,
+                "targetLanguage": target_lang,
+                "createdAt": timestamp,
+            }
+            messages.append(last)
+
+        conversations.append({
+            "id": conversation_id,
+            "doctorId": rng.choice(doctors),
+            "patientId": rng.choice(patients),
+            "doctorLanguage": doctor_language,
+            "patientLanguage": patient_language,
+            "messageCount": count,
+            **message_previews(last["role"], last["originalText"], last["translatedText"]),
+            "lastMessageRole": last["role"],
+            "lastActivityAt": last["createdAt"],
+            "createdAt": started,
+        })
+
+        if len(messages) >= batch_size * 4:
+            await flush()
+    await flush()
+
+
+async def seed(
+    db: Prisma,
+    users: int,
+    messages: int,
+    messages_per_conversation: int = 40,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    random_seed: int = 0,
+) -> None:
+    """Grow the connected database to at least the given user and message counts."""
+    # Mix the current size into the seed so top-up runs don't regenerate the same IDs
+    rng = random.Random(f"{random_seed}:{await db.message.count()}:{await db.user.count()}")
+    await seed_users(db, rng, users, batch_size)
+    await seed_messages(db, rng, messages, messages_per_conversation, batch_size)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="Seed a local database with synthetic conversations")
+    parser.add_argument("--users", type=int, default=1000, help="Target total users")
+    parser.add_argument("--messages", type=int, default=100_000, help="Target total messages")
+    parser.add_argument("--messages-per-conversation", type=int, default=40, help="Mean conversation length")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="Rows per create_many")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    args = parser.parse_args()
+
+    db = Prisma(http={"timeout": None})
+    await db.connect()
+    try:
+        start = time.perf_counter()
+        await seed(db, args.users, args.messages, args.messages_per_conversation, args.batch_size, args.seed)
+        print(
+            f"Seeded to {await db.user.count()} users, {await db.conversation.count()} conversations, "
+            f"{await db.message.count()} messages in {time.perf_counter() - start:.1f}s"
+        )
+    finally:
+        await db.disconnect()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
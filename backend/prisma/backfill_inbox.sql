@@ -0,0 +1,34 @@
+-- One-off backfill of the denormalized Conversation inbox columns.
+-- Run once after `prisma db push` on databases that already contain conversations:
+--   psql "$DATABASE_URL" -f prisma/backfill_inbox.sql
+-- New messages keep these columns current via send_message.
+
+-- Each party's preview is in their language (see message_previews in app/inbox.py).
+-- 120 must match MESSAGE_PREVIEW_LENGTH in app/schemas.py
+UPDATE "Conversation" c
+SET "messageCount"    = stats.count,
+    "doctorPreview"   = LEFT(CASE WHEN latest.role = 'doctor'
+                                  THEN latest."originalText" ELSE latest."translatedText" END, 120),
+    "patientPreview"  = LEFT(CASE WHEN latest.role = 'patient'
+                                  THEN latest."originalText" ELSE latest."translatedText" END, 120),
+    "lastMessageRole" = latest.role,
+    "lastActivityAt"  = latest."createdAt"
+FROM (
+    SELECT "conversationId", COUNT(*) AS count
+    FROM "Message"
+    GROUP BY "conversationId"
+) stats
+JOIN LATERAL (
+    SELECT m."originalText", m."translatedText", m.role, m."createdAt"
+    FROM "Message" m
+    WHERE m."conversationId" = stats."conversationId"
+    ORDER BY m."createdAt" DESC
+    LIMIT 1
+) latest ON TRUE
+WHERE c.id = stats."conversationId";
+
+-- `prisma db push` filled lastActivityAt with the push time on existing rows;
+-- conversations without messages fall back to their creation time
+UPDATE "Conversation"
+SET "lastActivityAt" = "createdAt"
+WHERE "messageCount" = 0;
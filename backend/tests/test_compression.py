@@ -0,0 +1,70 @@
+"""Tests for negotiated response compression."""
+
+import gzip
+
+import pytest
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+import app.compression as compression
+from app.compression import CompressionMiddleware, negotiate_encoding
+
+LARGE_BODY = "x" * 2048
+
+
+@pytest.fixture
+def client():
+    app = Starlette(routes=[
+        Route("/large", lambda request: PlainTextResponse(LARGE_BODY)),
+        Route("/small", lambda request: PlainTextResponse("ok")),
+    ])
+    app.add_middleware(CompressionMiddleware, minimum_size=1024)
+    return TestClient(app)
+
+
+@pytest.mark.parametrize("header, expected", [
+    ("gzip", "gzip"),
+    ("gzip;q=0", None),
+    ("gzip; q=0.5, deflate", "gzip"),
+    ("gzip;level=1;q=0.8", "gzip"),
+    ("identity", None),
+    ("", None),
+])
+def test_negotiate_gzip(monkeypatch, header, expected):
+    monkeypatch.setattr(compression, "brotli", None)
+    assert negotiate_encoding(header) == expected
+
+
+def test_negotiate_prefers_brotli_when_available(monkeypatch):
+    monkeypatch.setattr(compression, "brotli", object())
+    assert negotiate_encoding("gzip, br;q=1.0;level=1") == "br"
+    assert negotiate_encoding("gzip, br;q=0") == "gzip"
+
+
+def test_negotiate_skips_brotli_when_not_installed(monkeypatch):
+    monkeypatch.setattr(compression, "brotli", None)
+    assert negotiate_encoding("br") is None
+
+
+def test_large_response_is_compressed(client, monkeypatch):
+    monkeypatch.setattr(compression, "brotli", None)
+    response = client.get("/large", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert "Accept-Encoding" in response.headers["vary"]
+    # httpx decodes transparently; check the wire size as well
+    assert int(response.headers["content-length"]) == len(gzip.compress(LARGE_BODY.encode(), compresslevel=6))
+    assert response.text == LARGE_BODY
+
+
+def test_small_response_passes_through(client):
+    response = client.get("/small", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in response.headers
+    assert response.text == "ok"
+
+
+def test_no_accepted_encoding_passes_through(client):
+    response = client.get("/large", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in response.headers
+    assert response.text == LARGE_BODY
@@ -0,0 +1,94 @@
+"""Tests for speculative draft translations."""
+
+import asyncio
+
+import pytest
+
+import app.drafts as drafts
+from app.drafts import DRAFT_FAILED, DRAFT_READY, DRAFT_SUPERSEDED, DraftTranslator
+from app.gemini import TRANSLATION_FAILED_PREFIX
+
+
+@pytest.fixture
+def translations(monkeypatch):
+    """Stub translate_text; returns the list of texts it was called with."""
+    calls = []
+
+    async def fake_translate(text, source_lang, target_lang):
+        calls.append(text)
+        await asyncio.sleep(0.01)
+        if text.startswith("fail"):
+            return f"{TRANSLATION_FAILED_PREFIX} {text}"
+        return f"translated:{text}"
+
+    monkeypatch.setattr(drafts, "translate_text", fake_translate)
+    return calls
+
+
+def test_newer_draft_supersedes_older_one(translations):
+    async def scenario():
+        translator = DraftTranslator()
+        older = asyncio.create_task(translator.draft("conv", "doctor", "hel", "en", "es"))
+        await asyncio.sleep(0)
+        newer = asyncio.create_task(translator.draft("conv", "doctor", "hello", "en", "es"))
+        return await older, await newer
+
+    assert asyncio.run(scenario()) == (
+        (DRAFT_SUPERSEDED, None),
+        (DRAFT_READY, "translated:hello"),
+    )
+
+
+def test_consume_waits_for_matching_in_flight_draft(translations):
+    async def scenario():
+        translator = DraftTranslator()
+        draft = asyncio.create_task(translator.draft("conv", "doctor", "hello", "en", "es"))
+        await asyncio.sleep(0)
+        consumed = await translator.consume("conv", "doctor", "hello")
+        await draft
+        return consumed
+
+    assert asyncio.run(scenario()) == "translated:hello"
+    assert translations == ["hello"]
+
+
+def test_consume_returns_ready_draft_once(translations):
+    async def scenario():
+        translator = DraftTranslator()
+        await translator.draft("conv", "doctor", "hello", "en", "es")
+        return (
+            await translator.consume("conv", "doctor", "hello"),
+            await translator.consume("conv", "doctor", "hello"),
+        )
+
+    assert asyncio.run(scenario()) == ("translated:hello", None)
+    assert translations == ["hello"]
+
+
+def test_consume_ignores_draft_for_different_text(translations):
+    async def scenario():
+        translator = DraftTranslator()
+        await translator.draft("conv", "doctor", "hello", "en", "es")
+        return await translator.consume("conv", "doctor", "hello there")
+
+    assert asyncio.run(scenario()) is None
+
+
+def test_failed_translation_is_never_cached(translations):
+    async def scenario():
+        translator = DraftTranslator()
+        drafted = await translator.draft("conv", "doctor", "fail me", "en", "es")
+        return drafted, await translator.consume("conv", "doctor", "fail me")
+
+    assert asyncio.run(scenario()) == ((DRAFT_FAILED, None), None)
+
+
+def test_failed_translation_can_be_retried(translations):
+    async def scenario():
+        translator = DraftTranslator()
+        first = await translator.draft("conv", "doctor", "fail me", "en", "es")
+        second = await translator.draft("conv", "doctor", "fail me", "en", "es")
+        return first, second
+
+    assert asyncio.run(scenario()) == ((DRAFT_FAILED, None), (DRAFT_FAILED, None))
+    assert translations == ["fail me", "fail me"]
@@ -0,0 +1,142 @@
+"""Tests for the Idempotency-Key store."""
+
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+from pydantic import BaseModel
+
+from app.idempotency import IdempotencyStore
+
+
+class Body(BaseModel):
+    text: str
+
+
+def make_store(max_keys: int = 100) -> IdempotencyStore:
+    return IdempotencyStore(max_keys=max_keys, ttl_seconds=60)
+
+
+def test_concurrent_duplicate_awaits_in_flight_call():
+    async def scenario():
+        store = make_store()
+        calls = 0
+
+        async def handler():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return f"result-{calls}"
+
+        results = await asyncio.gather(*[
+            store.run("message", "key", Body(text="hi"), handler) for _ in range(3)
+        ])
+        return results, calls
+
+    results, calls = asyncio.run(scenario())
+    assert results == ["result-1"] * 3
+    assert calls == 1
+
+
+def test_retry_after_success_returns_stored_result():
+    async def scenario():
+        store = make_store()
+        calls = 0
+
+        async def handler():
+            nonlocal calls
+            calls += 1
+            return calls
+
+        first = await store.run("message", "key", Body(text="hi"), handler)
+        second = await store.run("message", "key", Body(text="hi"), handler)
+        return first, second, calls
+
+    assert asyncio.run(scenario()) == (1, 1, 1)
+
+
+def test_failed_handler_is_forgotten_and_retry_reruns():
+    async def scenario():
+        store = make_store()
+        calls = 0
+
+        async def handler():
+            nonlocal calls
+            calls += 1
+            if calls == 1:
+                raise RuntimeError("Gemini unavailable")
+            return "ok"
+
+        with pytest.raises(RuntimeError):
+            await store.run("message", "key", Body(text="hi"), handler)
+        return await store.run("message", "key", Body(text="hi"), handler), calls
+
+    assert asyncio.run(scenario()) == ("ok", 2)
+
+
+def test_different_body_under_same_key_is_rejected():
+    async def scenario():
+        store = make_store()
+
+        async def handler():
+            return "ok"
+
+        await store.run("message", "key", Body(text="hi"), handler)
+        await store.run("message", "key", Body(text="bye"), handler)
+
+    with pytest.raises(HTTPException) as exc_info:
+        asyncio.run(scenario())
+    assert exc_info.value.status_code == 422
+
+
+def test_waiter_takes_over_when_original_is_cancelled():
+    async def scenario():
+        store = make_store()
+        calls = 0
+        started = asyncio.Event()
+
+        async def handler():
+            nonlocal calls
+            calls += 1
+            started.set()
+            await asyncio.sleep(0.05)
+            return f"result-{calls}"
+
+        original = asyncio.create_task(store.run("message", "key", Body(text="hi"), handler))
+        await started.wait()
+        waiter = asyncio.create_task(store.run("message", "key", Body(text="hi"), handler))
+        await asyncio.sleep(0)
+        original.cancel()
+
+        with pytest.raises(asyncio.CancelledError):
+            await original
+        return await waiter, calls
+
+    assert asyncio.run(scenario()) == ("result-2", 2)
+
+
+def test_eviction_keeps_in_flight_entries():
+    async def scenario():
+        store = make_store(max_keys=1)
+        calls = 0
+        release = asyncio.Event()
+
+        async def slow():
+            nonlocal calls
+            calls += 1
+            await release.wait()
+            return "slow"
+
+        async def fast():
+            return "fast"
+
+        pending = asyncio.create_task(store.run("message", "slow", Body(text="a"), slow))
+        await asyncio.sleep(0)
+        # Pushes the store over max_keys while "slow" is still in flight
+        await store.run("message", "other", Body(text="b"), fast)
+        duplicate = asyncio.create_task(store.run("message", "slow", Body(text="a"), slow))
+        await asyncio.sleep(0)
+        release.set()
+        return await pending, await duplicate, calls
+
+    assert asyncio.run(scenario()) == ("slow", "slow", 1)
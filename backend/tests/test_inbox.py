@@ -0,0 +1,95 @@
+"""Tests for denormalized inbox fields and cursors."""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+
+from app.inbox import decode_inbox_cursor, encode_inbox_cursor, message_previews, record_message
+from app.schemas import MESSAGE_PREVIEW_LENGTH
+
+START = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+class FakeConversations:
+    """Applies update / update_many to one in-memory conversation row."""
+
+    def __init__(self, row):
+        self.row = row
+
+    async def update(self, where, data):
+        self.row["messageCount"] += data["messageCount"]["increment"]
+
+    async def update_many(self, where, data):
+        if self.row["lastActivityAt"] <= where["lastActivityAt"]["lte"]:
+            self.row.update(data)
+
+
+def make_message(role, original, translated, created_at):
+    return SimpleNamespace(
+        conversationId="conv",
+        role=role,
+        originalText=original,
+        translatedText=translated,
+        createdAt=created_at,
+    )
+
+
+def record_all(*messages):
+    row = {"messageCount": 0, "lastActivityAt": START}
+    transaction = SimpleNamespace(conversation=FakeConversations(row))
+
+    async def scenario():
+        for message in messages:
+            await record_message(transaction, message)
+
+    asyncio.run(scenario())
+    return row
+
+
+def test_cursor_round_trips():
+    conversation = SimpleNamespace(lastActivityAt=START + timedelta(microseconds=123), id="abc|def")
+    assert decode_inbox_cursor(encode_inbox_cursor(conversation)) == (conversation.lastActivityAt, "abc|def")
+
+
+@pytest.mark.parametrize("cursor", ["not base64!", "bm8tc2VwYXJhdG9y", "bm90LWEtZGF0ZXxpZA=="])
+def test_malformed_cursor_is_400(cursor):
+    with pytest.raises(HTTPException) as error:
+        decode_inbox_cursor(cursor)
+    assert error.value.status_code == 400
+
+
+def test_previews_are_in_each_party_language():
+    assert message_previews("patient", "Hola", "Hello") == {
+        "patientPreview": "Hola",
+        "doctorPreview": "Hello",
+    }
+    previews = message_previews("doctor", "x" * 500, "y" * 500)
+    assert previews == {
+        "doctorPreview": "x" * MESSAGE_PREVIEW_LENGTH,
+        "patientPreview": "y" * MESSAGE_PREVIEW_LENGTH,
+    }
+
+
+def test_newer_message_moves_last_message_forward():
+    row = record_all(
+        make_message("doctor", "Hello", "Hola", START + timedelta(seconds=1)),
+        make_message("patient", "Gracias", "Thanks", START + timedelta(seconds=2)),
+    )
+    assert row["messageCount"] == 2
+    assert row["lastMessageRole"] == "patient"
+    assert row["doctorPreview"] == "Thanks"
+    assert row["lastActivityAt"] == START + timedelta(seconds=2)
+
+
+def test_older_message_committing_second_only_counts():
+    row = record_all(
+        make_message("patient", "Gracias", "Thanks", START + timedelta(seconds=2)),
+        make_message("doctor", "Hello", "Hola", START + timedelta(seconds=1)),
+    )
+    assert row["messageCount"] == 2
+    assert row["lastMessageRole"] == "patient"
+    assert row["patientPreview"] == "Gracias"
+    assert row["lastActivityAt"] == START + timedelta(seconds=2)
@@ -0,0 +1,45 @@
+"""Tests for `fields=` projection parsing and column selection."""
+
+import pytest
+from fastapi import HTTPException
+
+from app.projection import parse_fields, select_fields
+from app.schemas import MessageResponse, SEARCH_RESULT_COLUMNS, SearchResult
+
+
+def test_no_fields_means_no_projection():
+    assert parse_fields(None, MessageResponse.model_fields) is None
+    assert select_fields(None, required={"id"}) is None
+
+
+def test_fields_are_trimmed_and_deduplicated():
+    assert parse_fields(" originalText,role ,role", MessageResponse.model_fields) == {"originalText", "role"}
+
+
+@pytest.mark.parametrize("fields", ["originalText,password", "", " , ,"])
+def test_unknown_or_empty_fields_are_400(fields):
+    with pytest.raises(HTTPException) as error:
+        parse_fields(fields, MessageResponse.model_fields)
+    assert error.value.status_code == 400
+
+
+def test_unknown_field_is_named_in_error():
+    with pytest.raises(HTTPException) as error:
+        parse_fields("role,password", MessageResponse.model_fields)
+    assert "password" in error.value.detail
+
+
+def test_search_selects_message_id_as_id():
+    projection = parse_fields("messageId,originalText", SearchResult.model_fields)
+    assert select_fields(projection, SEARCH_RESULT_COLUMNS) == {"id", "originalText"}
+
+
+def test_search_rejects_model_field_name():
+    with pytest.raises(HTTPException):
+        parse_fields("id", SearchResult.model_fields)
+
+
+def test_messages_always_select_id():
+    # get_messages reads id for lastMessageId even when the client omits it
+    projection = parse_fields("originalText", MessageResponse.model_fields)
+    assert select_fields(projection, required={"id"}) == {"id", "originalText"}
@@ -0,0 +1,91 @@
+"""Tests for latency-aware Gemini model routing."""
+
+import time
+
+from app.config import Settings
+from app.routing import ModelRouter
+
+
+def make_router() -> ModelRouter:
+    return ModelRouter(Settings(
+        GEMINI_CHAT_MODELS="fast,backup",
+        GEMINI_SUMMARY_MODELS="strong,backup",
+        GEMINI_MAX_ERROR_RATE=0.5,
+    ))
+
+
+def record(router: ModelRouter, model: str, latency_ms: float, ok: bool, times: int = 1) -> None:
+    for _ in range(times):
+        decision = router.route("translation", "hi", "en", "es")
+        router.record(decision, model, latency_ms, ok)
+
+
+def test_short_text_uses_chat_route():
+    router = make_router()
+    decision = router.route("translation", "hi", "en", "es")
+    assert decision.route == "chat"
+    assert decision.candidates == ["fast", "backup"]
+
+
+def test_model_that_only_failed_is_tried_last():
+    router = make_router()
+    # Stays below the degradation threshold, so "fast" is still nominally healthy
+    record(router, "fast", 50, ok=False, times=3)
+    record(router, "backup", 400, ok=True, times=4)
+
+    assert router.route("translation", "hi", "en", "es").candidates == ["backup", "fast"]
+
+
+def test_error_rate_penalises_latency():
+    router = make_router()
+    record(router, "fast", 100, ok=True)
+    record(router, "fast", 100, ok=False, times=2)
+    record(router, "backup", 150, ok=True)
+
+    assert router.route("translation", "hi", "en", "es").candidates == ["backup", "fast"]
+
+
+def test_untried_model_is_sampled_first():
+    router = make_router()
+    record(router, "fast", 100, ok=True)
+
+    assert router.route("translation", "hi", "en", "es").candidates == ["backup", "fast"]
+
+
+def record_summary(router: ModelRouter, model: str, latency_ms: float, ok: bool, times: int = 1) -> None:
+    for _ in range(times):
+        decision = router.route("summary", "long transcript")
+        router.record(decision, model, latency_ms, ok)
+
+
+def test_summary_latency_does_not_affect_chat_ranking():
+    router = make_router()
+    record(router, "fast", 300, ok=True)
+    record(router, "backup", 200, ok=True)
+    # "backup" is also the summary fallback; its slow summaries must not count for chat
+    record_summary(router, "backup", 20000, ok=True, times=5)
+
+    assert router.route("translation", "hi", "en", "es").candidates == ["backup", "fast"]
+
+
+def test_slow_summaries_do_not_degrade_model():
+    router = make_router()
+    # Above the translation limit, within the summary limit
+    record_summary(router, "strong", 20000, ok=True, times=5)
+
+    assert router.is_healthy("summary", "strong")
+    assert router.is_healthy("chat", "strong")
+    assert router.route("summary", "long transcript").candidates == ["strong", "backup"]
+
+
+def test_successful_probe_after_cooldown_reseeds_stats():
+    router = make_router()
+    record(router, "fast", 20000, ok=True)
+    assert not router.is_healthy("chat", "fast")
+
+    # Cooldown elapses, then a fast probe succeeds
+    router.stats[("chat", "fast")].degraded_until = time.monotonic() - 1
+    record(router, "fast", 100, ok=True)
+
+    assert router.is_healthy("chat", "fast")
+    assert router.stats[("chat", "fast")].latency_ms == 100
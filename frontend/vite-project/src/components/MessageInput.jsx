@@ -3,15 +3,40 @@
  * Text input for sending messages with neumorphic design
  */
 
-import { useState } from 'react';
-import { sendMessage } from '../services/api';
+import { useState, useEffect, useRef } from 'react';
+import { sendMessage, draftMessage } from '../services/api';
 import NeumorphicInput from './neumorphic/NeumorphicInput';
 import NeumorphicIconButton from './neumorphic/NeumorphicIconButton';
 
+// Wait for typing to pause this long before requesting a draft translation
+const DRAFT_DEBOUNCE_MS = 600;
+
 export default function MessageInput({ conversationId, role, onMessageSent }) {
   const [text, setText] = useState('');
   const [sending, setSending] = useState(false);
   const [error, setError] = useState(null);
+  // Idempotency key for the text being sent; kept across failed attempts so
+  // re-sending the same text never creates a duplicate message
+  const pendingSend = useRef({ text: null, key: null });
+
+  // Translate the draft in the background once the text stops changing,
+  // so sending usually finds the translation already done on the server
+  useEffect(() => {
+    const trimmedText = text.trim();
+    if (!trimmedText || !conversationId || sending) return;
+
+    const controller = new AbortController();
+    const timer = setTimeout(() => {
+      draftMessage(conversationId, role, trimmedText, controller.signal).catch(() => {
+        // Drafts are best-effort; sendMessage translates on its own if needed
+      });
+    }, DRAFT_DEBOUNCE_MS);
+
+    return () => {
+      clearTimeout(timer);
+      controller.abort();
+    };
+  }, [text, conversationId, role, sending]);
 
   const handleSubmit = async (e) => {
     e.preventDefault();
@@ -22,8 +47,13 @@ export default function MessageInput({ conversationId, role, onMessageSent }) {
     setSending(true);
     setError(null);
 
+    if (pendingSend.current.text !== trimmedText) {
+      pendingSend.current = { text: trimmedText, key: crypto.randomUUID() };
+    }
+
     try {
-      const message = await sendMessage(conversationId, role, trimmedText);
+      const message = await sendMessage(conversationId, role, trimmedText, pendingSend.current.key);
+      pendingSend.current = { text: null, key: null };
       setText('');
       if (onMessageSent) onMessageSent(message);
     } catch (err) {
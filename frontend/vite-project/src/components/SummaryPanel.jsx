@@ -3,7 +3,7 @@
  * Modal for displaying AI-generated conversation summary with neumorphic design
  */
 
-import { useState, useEffect } from 'react';
+import { useState, useEffect, useRef } from 'react';
 import { generateSummary } from '../services/api';
 import NeumorphicCard from './neumorphic/NeumorphicCard';
 import NeumorphicButton from './neumorphic/NeumorphicButton';
@@ -13,13 +13,18 @@ export default function SummaryPanel({ conversationId, onClose }) {
   const [summary, setSummary] = useState(null);
   const [loading, setLoading] = useState(false);
   const [error, setError] = useState(null);
+  // Shared by double-clicks and retries until a summary comes back,
+  // so the backend generates it only once
+  const idempotencyKey = useRef(null);
 
   const handleGenerateSummary = async () => {
+    if (!idempotencyKey.current) idempotencyKey.current = crypto.randomUUID();
     setLoading(true);
     setError(null);
 
     try {
-      const response = await generateSummary(conversationId);
+      const response = await generateSummary(conversationId, idempotencyKey.current);
+      idempotencyKey.current = null;
       setSummary(response);
     } catch (err) {
       setError(err.message || 'Failed to generate summary');
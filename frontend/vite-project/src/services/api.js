@@ -5,22 +5,41 @@
 
 const API_BASE_URL = import.meta.env.VITE_API_URL || 'http://localhost:8000';
 
+// Delay between retries of requests that failed at the network level
+const RETRY_DELAY_MS = 1000;
+
+/**
+ * Retry fetch on network failures only (no response at all).
+ * Only used for requests sent with an Idempotency-Key, so retries are safe.
+ */
+async function fetchWithRetry(url, config, retries) {
+  for (let attempt = 0; ; attempt++) {
+    try {
+      return await fetch(url, config);
+    } catch (error) {
+      if (attempt >= retries || error.name === 'AbortError') throw error;
+      await new Promise((resolve) => setTimeout(resolve, RETRY_DELAY_MS * (attempt + 1)));
+    }
+  }
+}
+
 /**
  * Generic fetch wrapper with error handling
  */
 async function apiRequest(endpoint, options = {}) {
   const url = `${API_BASE_URL}${endpoint}`;
+  const { headers, retries = 0, ...fetchOptions } = options;
   
   const config = {
+    ...fetchOptions,
     headers: {
       'Content-Type': 'application/json',
-      ...options.headers,
+      ...headers,
     },
-    ...options,
   };
 
   try {
-    const response = await fetch(url, config);
+    const response = await fetchWithRetry(url, config, retries);
     
     if (!response.ok) {
       const error = await response.json().catch(() => ({ detail: 'Request failed' }));
@@ -55,22 +74,44 @@ export async function getConversation(conversationId) {
 
 // ============ Message API ============
 
-export async function sendMessage(conversationId, role, text) {
+/**
+ * Send a message. Reuse the same idempotencyKey when re-sending the same
+ * message so the backend returns the original instead of a duplicate.
+ */
+export async function sendMessage(conversationId, role, text, idempotencyKey = crypto.randomUUID()) {
   return apiRequest('/message', {
     method: 'POST',
+    headers: { 'Idempotency-Key': idempotencyKey },
     body: JSON.stringify({ conversationId, role, text }),
+    retries: 2,
   });
 }
 
+/**
+ * Request a speculative translation of text that is still being typed.
+ * The backend keeps the latest draft so sendMessage can skip the Gemini call.
+ * @param {AbortSignal} [signal] - Aborts the request when a newer draft supersedes it
+ */
+export async function draftMessage(conversationId, role, text, signal) {
+  return apiRequest('/message/draft', {
+    method: 'POST',
+    body: JSON.stringify({ conversationId, role, text }),
+    signal,
+  });
+}
+
+// Only the message fields the chat view renders; the backend skips the rest
+const CHAT_MESSAGE_FIELDS = 'id,role,originalText,translatedText,createdAt';
+
 /**
  * Get messages with polling support
  * @param {string} conversationId - Conversation ID
  * @param {string|null} afterMessageId - Get messages after this ID (for polling)
  */
 export async function getMessages(conversationId, afterMessageId = null) {
-  let endpoint = `/messages/${conversationId}`;
+  let endpoint = `/messages/${conversationId}?fields=${CHAT_MESSAGE_FIELDS}`;
   if (afterMessageId) {
-    endpoint += `?after=${afterMessageId}`;
+    endpoint += `&after=${afterMessageId}`;
   }
   return apiRequest(endpoint);
 }
@@ -87,10 +128,12 @@ export async function searchMessages(query, conversationId = null) {
 
 // ============ Summary API ============
 
-export async function generateSummary(conversationId) {
+export async function generateSummary(conversationId, idempotencyKey = crypto.randomUUID()) {
   return apiRequest('/summary', {
     method: 'POST',
+    headers: { 'Idempotency-Key': idempotencyKey },
     body: JSON.stringify({ conversationId }),
+    retries: 2,
   });
 }
 